@@ -8,22 +8,57 @@ Usage:
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import http.client
 import json
 import os
 import re
 import subprocess
 import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 ROOT = Path(__file__).resolve().parents[2]
 BUILD_DIR = ROOT / "contracts" / "build"
 CONFIG_PATH = ROOT / "deploy" / "config" / "mainnet_contracts.json"
 TESTNET_CONFIG_PATH = ROOT / "deploy" / "config" / "testnet_contracts.json"
 WALLET_CONFIG = ROOT / "deploy" / "mainnet" / "wallets" / "wallet-config.yaml"
 
-HASH_PATTERN = re.compile(r"(0x)?[a-fA-F0-9]{40}")
-TX_PATTERN = re.compile(r"(0x)?[a-fA-F0-9]{64}")
+# neo-go prints "Contract hash: <hash>" for calc-hash and "Contract: <hash>" for
+# deploy; a non-awaited deploy prints the transaction hash on a line of its own.
+HASH_PATTERN = re.compile(r"\bContract(?: hash)?:\s*(?:0x)?([a-fA-F0-9]{40})\b")
+TX_PATTERN = re.compile(
+    r"^(?:Sent invocation transaction\s+|txid:?\s*)?(?:0x)?([a-fA-F0-9]{64})\s*$",
+    re.MULTILINE,
+)
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+NEF_MAGIC = b"NEF3"
+
+MAX_WORKERS = 8
+OUTPUT_LOCK = threading.Lock()
+AWAIT_TIMEOUT = 120.0
+POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 15.0
+RPC_TIMEOUT = 30.0
+RPC_RETRIES = 3
+RPC_RETRY_BACKOFF = 0.3
+# getapplicationlog errors meaning "not persisted yet", mirroring isNotFoundError
+# in infrastructure/chain/types.go: -100 "Unknown transaction", -105 "Unknown
+# script container". C# ApplicationLogs nodes use -32602 with the same text in
+# `data`, so the messages are matched too.
+RPC_UNKNOWN_TX_CODES = frozenset({-100, -105})
+RPC_UNKNOWN_TX_MESSAGES = ("unknown transaction", "unknown script container")
 
 
 def load_env(path: Path) -> dict[str, str]:
@@ -39,13 +74,53 @@ def load_env(path: Path) -> dict[str, str]:
     return data
 
 
-def run(cmd: list[str]) -> str:
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(result.stdout)
-        print(result.stderr)
+@functools.lru_cache(maxsize=1)
+def _env_file() -> dict[str, str]:
+    return load_env(ROOT / ".env")
+
+
+def get_env(key: str) -> str | None:
+    """Read `key` from the process environment, falling back to the repo .env file."""
+    return os.getenv(key) or _env_file().get(key)
+
+
+def spawn(cmd: list[str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+
+
+def stream_output(proc: subprocess.Popen, label: str | None = None) -> str:
+    """Collect the merged output of `proc`, echoing each line as it arrives when `label` is set."""
+    lines: list[str] = []
+    for line in proc.stdout:
+        lines.append(line)
+        if label is not None:
+            with OUTPUT_LOCK:
+                sys.stdout.write(f"[{label}] {line}")
+                sys.stdout.flush()
+    proc.wait()
+    return "".join(lines)
+
+
+def run(cmd: list[str], label: str | None = None) -> str:
+    proc = spawn(cmd)
+    output = stream_output(proc, label)
+    if proc.returncode != 0:
+        if label is None:
+            print(output)
         raise RuntimeError(f"Command failed: {' '.join(cmd)}")
-    return (result.stdout or "") + (result.stderr or "")
+    return output
+
+
+def find_hex(pattern: re.Pattern, text: str) -> str:
+    """Return the first `pattern` match in `text` as 0x-prefixed hex, or ""."""
+    match = pattern.search(text)
+    return f"0x{match.group(1)}" if match else ""
 
 
 def calc_hash(nef: Path, manifest: Path, sender: str) -> str:
@@ -62,15 +137,95 @@ def calc_hash(nef: Path, manifest: Path, sender: str) -> str:
             sender,
         ]
     )
-    match = HASH_PATTERN.search(output)
-    if not match:
+    contract_hash = find_hex(HASH_PATTERN, output)
+    if not contract_hash:
         raise RuntimeError(f"Could not parse contract hash from: {output}")
-    value = match.group(0)
-    return value if value.startswith("0x") else f"0x{value}"
+    return contract_hash
+
+
+def address_to_script_hash(address: str) -> bytes:
+    """Decode a Neo N3 address (or 0x-prefixed script hash) to the 20-byte little-endian script hash."""
+    if address.startswith("0x"):
+        return bytes.fromhex(address[2:])[::-1]
+    num = 0
+    for char in address:
+        num = num * 58 + BASE58_ALPHABET.index(char)
+    raw = num.to_bytes(25, "big")
+    payload, checksum = raw[:-4], raw[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        raise ValueError(f"invalid address checksum: {address}")
+    return payload[1:]
+
+
+def _push_int(value: int) -> bytes:
+    if -1 <= value <= 16:
+        return bytes([0x10 + value])
+    length = (value.bit_length() + 8) // 8
+    for opcode, size in enumerate((1, 2, 4, 8, 16, 32)):
+        if length <= size:
+            return bytes([opcode]) + value.to_bytes(size, "little", signed=True)
+    raise ValueError(f"integer too large to push: {value}")
+
+
+def _push_data(data: bytes) -> bytes:
+    if len(data) < 0x100:
+        return b"\x0c" + len(data).to_bytes(1, "little") + data
+    if len(data) < 0x10000:
+        return b"\x0d" + len(data).to_bytes(2, "little") + data
+    return b"\x0e" + len(data).to_bytes(4, "little") + data
+
+
+def ripemd160_available() -> bool:
+    try:
+        hashlib.new("ripemd160")
+    except ValueError:
+        return False
+    return True
+
+
+def calc_hash_local(nef: Path, manifest: Path, sender: str) -> str:
+    """
+    Compute a contract hash the way Neo N3 does on deploy.
+
+    The hash is Hash160 of the script `ABORT; PUSH sender; PUSH nef.checksum;
+    PUSH manifest.name`, so it only needs the NEF checksum (its last four bytes)
+    and the manifest name, not a neo-go process.
+    """
+    nef_bytes = nef.read_bytes()
+    if nef_bytes[:4] != NEF_MAGIC:
+        raise RuntimeError(f"{nef} is not a NEF3 file")
+    checksum = int.from_bytes(nef_bytes[-4:], "little")
+    name = json.loads(manifest.read_text(encoding="utf-8"))["name"]
+
+    script = (
+        b"\x38"
+        + _push_data(address_to_script_hash(sender))
+        + _push_int(checksum)
+        + _push_data(name.encode("utf-8"))
+    )
+    digest = hashlib.new("ripemd160", hashlib.sha256(script).digest()).digest()
+    return f"0x{digest[::-1].hex()}"
 
 
-def deploy(nef: Path, manifest: Path, rpc: str) -> tuple[str, str]:
-    output = run(
+def calc_hash_all(contracts: list[tuple[str, Path, Path]], sender: str) -> dict[str, str]:
+    if ripemd160_available():
+        return {name: calc_hash_local(nef, manifest, sender) for name, nef, manifest in contracts}
+
+    # Some OpenSSL 3 builds drop RIPEMD-160 from hashlib; fall back to neo-go,
+    # one process per CPU at most since calc-hash is CPU-bound.
+    workers = max(1, min(MAX_WORKERS, len(contracts), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(calc_hash, nef, manifest, sender)
+            for name, nef, manifest in contracts
+        }
+    return {name: future.result() for name, future in futures.items()}
+
+
+def start_deploy(nef: Path, manifest: Path, rpc: str) -> subprocess.Popen:
+    # No --await: the transaction is only submitted here, confirmation is
+    # polled for the whole batch in await_transactions().
+    return spawn(
         [
             "neo-go",
             "contract",
@@ -80,22 +235,126 @@ def deploy(nef: Path, manifest: Path, rpc: str) -> tuple[str, str]:
             "--wallet-config",
             str(WALLET_CONFIG),
             "--force",
-            "--await",
-            "--timeout",
-            "120s",
             "-i",
             str(nef),
             "-m",
             str(manifest),
         ]
     )
-    tx_match = TX_PATTERN.search(output)
-    if tx_match:
-        value = tx_match.group(0)
-        tx_hash = value if value.startswith("0x") else f"0x{value}"
-    else:
-        tx_hash = ""
-    return output, tx_hash
+
+
+def deploy_all(contracts: list[tuple[str, Path, Path]], rpc: str) -> tuple[dict[str, str], list[str]]:
+    """Submit every deploy and return the tx hashes of the submitted ones plus the names that failed."""
+
+    def deploy(nef: Path, manifest: Path, label: str) -> tuple[int, str]:
+        proc = start_deploy(nef, manifest, rpc)
+        output = stream_output(proc, label)
+        return proc.returncode, output
+
+    # Each worker starts its own neo-go process, so at most MAX_WORKERS run at once.
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(contracts))) as pool:
+        results = {name: pool.submit(deploy, nef, manifest, name) for name, nef, manifest in contracts}
+
+    tx_hashes: dict[str, str] = {}
+    failed: list[str] = []
+    for name, future in results.items():
+        returncode, output = future.result()
+        if returncode != 0:
+            failed.append(name)
+            continue
+        tx_hashes[name] = find_hex(TX_PATTERN, output)
+    return tx_hashes, failed
+
+
+class RpcClient:
+    """JSON-RPC client that keeps one connection alive across poll rounds."""
+
+    def __init__(self, url: str):
+        self.url = url
+        parts = urllib.parse.urlsplit(url)
+        self._https = parts.scheme == "https"
+        self._netloc = parts.netloc
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._conn: http.client.HTTPConnection | None = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            conn_cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            self._conn = conn_cls(self._netloc, timeout=RPC_TIMEOUT)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _post(self, body: bytes) -> tuple[int, bytes]:
+        for attempt in range(RPC_RETRIES):
+            try:
+                conn = self._connection()
+                conn.request("POST", self._path, body, {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                # Drop the connection; the server may have closed the keep-alive.
+                self.close()
+                if attempt == RPC_RETRIES - 1:
+                    raise
+                time.sleep(RPC_RETRY_BACKOFF * 2**attempt)
+        raise AssertionError("unreachable")
+
+    def batch(self, calls: list[tuple[str, list]]) -> list[dict]:
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        status, data = self._post(json.dumps(payload).encode("utf-8"))
+        if status // 100 != 2:
+            raise RuntimeError(f"RPC {self.url} returned HTTP {status}")
+        replies = json.loads(data)
+        if not isinstance(replies, list):
+            # A rejected batch comes back as a single error object.
+            raise RuntimeError(f"RPC {self.url} rejected batch: {replies.get('error', replies)}")
+        by_id = {reply.get("id"): reply for reply in replies}
+        return [by_id.get(i, {}) for i in range(len(calls))]
+
+
+def is_unknown_tx_error(error: dict) -> bool:
+    """Whether a JSON-RPC `error` only means the transaction is not in a block yet."""
+    if error.get("code") in RPC_UNKNOWN_TX_CODES:
+        return True
+    text = f"{error.get('message', '')} {error.get('data', '')}".lower()
+    return any(message in text for message in RPC_UNKNOWN_TX_MESSAGES)
+
+
+def await_transactions(client: RpcClient, tx_hashes: dict[str, str]) -> dict[str, str]:
+    """Poll getapplicationlog for all `tx_hashes` in one batch per round; return name -> vmstate."""
+    pending = dict(tx_hashes)
+    states: dict[str, str] = {}
+    delay = POLL_INTERVAL
+    deadline = time.monotonic() + AWAIT_TIMEOUT
+    while pending:
+        names = list(pending)
+        replies = client.batch([("getapplicationlog", [pending[name]]) for name in names])
+        for name, reply in zip(names, replies):
+            error = reply.get("error")
+            if error and not is_unknown_tx_error(error):
+                raise RuntimeError(f"getapplicationlog failed for {name}: {error.get('message', error)}")
+            log = reply.get("result")
+            if not log:
+                continue
+            executions = log.get("executions") or [{}]
+            faulted = [e.get("vmstate", "") for e in executions if e.get("vmstate") != "HALT"]
+            states[name] = faulted[0] if faulted else "HALT"
+            del pending[name]
+        if not pending:
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RuntimeError(f"Timed out waiting for transactions: {', '.join(pending)}")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, MAX_POLL_INTERVAL)
+    return states
 
 
 def now_iso() -> str:
@@ -109,12 +368,110 @@ def load_json(path: Path) -> dict:
 
 
 def write_json(path: Path, payload: dict) -> None:
-    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    else:
+        data = (json.dumps(payload, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class DeploymentConfig:
+    """In-memory mainnet_contracts.json, written back only when it changed."""
+
+    def __init__(self, path: Path, payload: dict):
+        self.path = path
+        self.payload = payload
+        self.dirty = False
+
+    def record(self, section: str, name: str, entry: dict, updated_at: str) -> None:
+        self.payload[section][name] = entry
+        self.payload["updated_at"] = updated_at
+        self.dirty = True
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        write_json(self.path, self.payload)
+        self.dirty = False
+
+
+def deploy_batch(
+    section: str,
+    contracts: list[tuple[str, str, str]],
+    templates: dict,
+    config: DeploymentConfig,
+    sender: str,
+    client: RpcClient,
+) -> None:
+    available: list[tuple[str, Path, Path]] = []
+    for name, nef_name, manifest_name in contracts:
+        nef = BUILD_DIR / nef_name
+        manifest = BUILD_DIR / manifest_name
+        if not nef.exists() or not manifest.exists():
+            print(f"  ⚠️  {name}: build artifacts missing, skipping")
+            continue
+        available.append((name, nef, manifest))
+    if not available:
+        return
+
+    print(f"\n--- Deploying {', '.join(name for name, _, _ in available)} ---")
+    hashes = calc_hash_all(available, sender)
+    deployed, deploy_failed = deploy_all(available, client.url)
+
+    # Persist submitted transactions before waiting so a timeout or crash
+    # during confirmation still leaves their hashes on disk.
+    ts = now_iso()
+    entries: dict[str, dict] = {}
+    for name, tx_hash in deployed.items():
+        entry = dict(templates.get(name) or {})
+        entry.update(
+            {
+                "name": entry.get("name") or name,
+                "address": hashes[name],
+                "network": "mainnet",
+                "status": "pending",
+                "deployed_at": ts,
+            }
+        )
+        if tx_hash:
+            entry["tx_hash"] = tx_hash
+        entries[name] = entry
+        config.record(section, name, entry, ts)
+    config.flush()
+
+    # Confirm whatever was broadcast even if other deploys in the batch
+    # failed: those transactions are on chain and a rerun cannot redo them.
+    states = await_transactions(client, {name: tx_hash for name, tx_hash in deployed.items() if tx_hash})
+
+    ts = now_iso()
+    failed: list[str] = []
+    for name, entry in entries.items():
+        vmstate = states.get(name)
+        if vmstate is None:
+            # neo-go exited cleanly but printed no tx hash, so there is
+            # nothing to confirm; leave it for a manual check.
+            print(f"  ⚠️  {name}: no transaction hash in deploy output, marking unconfirmed")
+            config.record(section, name, dict(entry, status="unconfirmed"), ts)
+        elif vmstate == "HALT":
+            config.record(section, name, dict(entry, status="deployed"), ts)
+        else:
+            failed.append(name)
+            config.record(section, name, dict(entry, status="failed", vmstate=vmstate), ts)
+    config.flush()
+
+    errors = []
+    if deploy_failed:
+        errors.append(f"deploy failed: {', '.join(deploy_failed)}")
+    if failed:
+        errors.append(f"transaction did not HALT: {', '.join(failed)}")
+    if errors:
+        raise RuntimeError("; ".join(errors))
 
 
 def main() -> None:
-    env = load_env(ROOT / ".env")
-    sender = os.getenv("NEO_MAINNET_ADDRESS") or env.get("NEO_MAINNET_ADDRESS")
+    sender = get_env("NEO_MAINNET_ADDRESS")
     if not sender:
         raise RuntimeError("NEO_MAINNET_ADDRESS is required (set in .env or env).")
 
@@ -140,11 +497,9 @@ def main() -> None:
         ("ForeverAlbum", "ForeverAlbum.nef", "ForeverAlbum.manifest.json"),
     ]
 
-    build_nefs = {p.stem for p in BUILD_DIR.glob("*.nef")}
+    miniapp_nefs = sorted(p.stem for p in BUILD_DIR.glob("MiniApp*.nef") if p.stem != "MiniAppBase")
     miniapps = []
-    for name in sorted(build_nefs):
-        if not name.startswith("MiniApp") or name == "MiniAppBase":
-            continue
+    for name in miniapp_nefs:
         template = miniapp_templates.get(name)
         if not template:
             print(f"⚠️  Skipping {name}: not found in testnet config")
@@ -165,59 +520,14 @@ def main() -> None:
     print(f"RPC: {rpc}")
     print(f"Deployer: {sender}")
 
-    for name, nef_name, manifest_name in platform_contracts:
-        nef = BUILD_DIR / nef_name
-        manifest = BUILD_DIR / manifest_name
-        if not nef.exists() or not manifest.exists():
-            print(f"  ⚠️  {name}: build artifacts missing, skipping")
-            continue
-
-        print(f"\n--- Deploying {name} ---")
-        contract_hash = calc_hash(nef, manifest, sender)
-        output, tx_hash = deploy(nef, manifest, rpc)
-        print(output)
-        entry = dict(platform_templates.get(name) or {})
-        entry.update(
-            {
-                "name": entry.get("name") or name,
-                "address": contract_hash,
-                "network": "mainnet",
-                "status": "deployed",
-                "deployed_at": now_iso(),
-            }
-        )
-        if tx_hash:
-            entry["tx_hash"] = tx_hash
-        config["contracts"][name] = entry
-        config["updated_at"] = now_iso()
-        write_json(CONFIG_PATH, config)
-
-    for name, nef_name, manifest_name in miniapps:
-        nef = BUILD_DIR / nef_name
-        manifest = BUILD_DIR / manifest_name
-        if not nef.exists() or not manifest.exists():
-            print(f"  ⚠️  {name}: build artifacts missing, skipping")
-            continue
-
-        print(f"\n--- Deploying {name} ---")
-        contract_hash = calc_hash(nef, manifest, sender)
-        output, tx_hash = deploy(nef, manifest, rpc)
-        print(output)
-        entry = dict(miniapp_templates.get(name) or {})
-        entry.update(
-            {
-                "name": entry.get("name") or name,
-                "address": contract_hash,
-                "network": "mainnet",
-                "status": "deployed",
-                "deployed_at": now_iso(),
-            }
-        )
-        if tx_hash:
-            entry["tx_hash"] = tx_hash
-        config["miniapp_contracts"][name] = entry
-        config["updated_at"] = now_iso()
-        write_json(CONFIG_PATH, config)
+    store = DeploymentConfig(CONFIG_PATH, config)
+    client = RpcClient(rpc)
+    try:
+        deploy_batch("contracts", platform_contracts, platform_templates, store, sender, client)
+        deploy_batch("miniapp_contracts", miniapps, miniapp_templates, store, sender, client)
+    finally:
+        client.close()
+        store.flush()
 
     print("\n=== Mainnet deployment complete ===")
 
@@ -20,14 +20,16 @@ Usage:
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 import shutil
 import subprocess
 import sys
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent.parent
@@ -50,6 +52,7 @@ def reverse_hash160(value: str) -> str:
     return "0x" + raw[::-1].hex()
 
 
+@functools.lru_cache(maxsize=1)
 def resolve_neoxp() -> str:
     override = os.environ.get("NEOXP", "neoxp")
     resolved = shutil.which(override)
@@ -66,6 +69,7 @@ def resolve_neoxp() -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def dotnet_env() -> Dict[str, str]:
     env = dict(os.environ)
     if env.get("DOTNET_ROOT"):
@@ -115,7 +119,9 @@ class PlatformInitializer:
             raise FileNotFoundError(f"Deployed contracts file not found: {DEPLOYED_FILE}")
         return json.loads(DEPLOYED_FILE.read_text())
 
-    def _wallet_account(self, wallet_name: str) -> Dict[str, Any]:
+    @functools.cached_property
+    def _wallets(self) -> Dict[str, Any]:
+        # `neoxp` is a .NET tool with a slow cold start; list wallets once per run.
         if not self.network.neo_express_config:
             return {}
 
@@ -127,9 +133,21 @@ class PlatformInitializer:
         )
         if result.returncode != 0:
             raise RuntimeError(f"Failed to list wallets: {result.stderr or result.stdout}")
+        return json.loads(result.stdout)
+
+    @functools.cached_property
+    def _tee_hash(self) -> str:
+        tee_hash = self._wallet_account("tee").get("script-hash", "")
+        if not tee_hash:
+            raise RuntimeError("TEE wallet not found or missing script-hash (expected wallet name: tee)")
+        return tee_hash
+
+    @functools.cached_property
+    def _tee_updater_arg(self) -> str:
+        return reverse_hash160(self._tee_hash)
 
-        wallets = json.loads(result.stdout)
-        entry = wallets.get(wallet_name)
+    def _wallet_account(self, wallet_name: str) -> Dict[str, Any]:
+        entry = self._wallets.get(wallet_name)
         if entry is None:
             return {}
         if isinstance(entry, list):
@@ -139,27 +157,42 @@ class PlatformInitializer:
         return {}
 
     def invoke(self, contract_name: str, method: str, *args: str, signer: str = "owner") -> None:
-        contract_address = self.deployed.get(contract_name)
-        if not contract_address:
-            raise RuntimeError(f"contract not found in deployed_contracts.json: {contract_name}")
+        self.invoke_batch([(contract_name, method, args)], signer=signer)
+
+    def invoke_batch(self, calls: Sequence[Tuple[str, str, Sequence[str]]], signer: str = "owner") -> None:
+        """
+        Send several contract calls as a single transaction.
+
+        The calls are written to a Neo Express invocation file, which
+        `neoxp contract invoke` compiles into one script, so the whole batch
+        costs one neoxp start and one block instead of one per call.
+        """
+        if not calls:
+            return
 
         if not self.network.neo_express_config:
             raise RuntimeError("RPC-only initialization is not implemented; use neoexpress or initialize manually.")
 
-        cmd = [
-            self.neoxp,
-            "contract",
-            "run",
-            "-i",
-            self.network.neo_express_config,
-            "-a",
-            signer,
-            contract_address,
-            method,
-        ]
-        cmd.extend(str(a) for a in args)
-
-        result = subprocess.run(cmd, capture_output=True, text=True, env=self.env)
+        operations: List[Dict[str, Any]] = []
+        for contract_name, method, args in calls:
+            contract_address = self.deployed.get(contract_name)
+            if not contract_address:
+                raise RuntimeError(f"contract not found in deployed_contracts.json: {contract_name}")
+            operations.append({"contract": contract_address, "operation": method, "args": [str(a) for a in args]})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            invoke_file = Path(tmp) / "batch.neo-invoke.json"
+            invoke_file.write_text(json.dumps(operations, indent=2))
+            cmd = [
+                self.neoxp,
+                "contract",
+                "invoke",
+                "-i",
+                self.network.neo_express_config,
+                str(invoke_file),
+                signer,
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, env=self.env)
         if result.returncode != 0:
             raise RuntimeError(f"neoxp invoke failed: {result.stderr or result.stdout}")
 
@@ -167,20 +200,18 @@ class PlatformInitializer:
         if not self.network.neo_express_config:
             return
 
-        tee_account = self._wallet_account("tee")
-        tee_hash = tee_account.get("script-hash", "")
-        if not tee_hash:
-            raise RuntimeError("TEE wallet not found or missing script-hash (expected wallet name: tee)")
-
-        updater_arg = reverse_hash160(tee_hash)
+        tee_hash = self._tee_hash
+        updater_arg = self._tee_updater_arg
 
         print("\n=== Setting platform Updater (TEE signer) ===")
+        calls = []
         for contract_name in ("PriceFeed", "RandomnessLog", "AutomationAnchor", "ServiceLayerGateway"):
             if contract_name not in self.deployed:
                 print(f"  - {contract_name}: not deployed, skipping")
                 continue
             print(f"  - {contract_name}.setUpdater({tee_hash})")
-            self.invoke(contract_name, "setUpdater", updater_arg)
+            calls.append((contract_name, "setUpdater", (updater_arg,)))
+        self.invoke_batch(calls)
 
     def run(self) -> None:
         if self.network.name != "neoexpress":
@@ -26,6 +26,13 @@ get_contract() {
   jq -r --arg name "$name" '.contracts[$name].address // empty' "$CONFIG_PATH"
 }
 
+LOG_DIR="$(mktemp -d)"
+trap 'rm -rf "$LOG_DIR"' EXIT
+PIDS=()
+NAMES=()
+
+# Submit each setUpdater in the background so all transactions land in the
+# same block; neo-go has no multi-call invoke, but the block wait is shared.
 invoke_set_updater() {
   local name="$1"
   local hash="$2"
@@ -44,7 +51,10 @@ invoke_set_updater() {
     setUpdater \
     "hash160:${UPDATER_ADDRESS}" \
     -- \
-    "${SIGNER_ADDRESS:-$UPDATER_ADDRESS}:CalledByEntry"
+    "${SIGNER_ADDRESS:-$UPDATER_ADDRESS}:CalledByEntry" \
+    >"${LOG_DIR}/${name}.log" 2>&1 &
+  PIDS+=("$!")
+  NAMES+=("$name")
 }
 
 echo "=== Setting mainnet updaters ==="
@@ -59,4 +69,23 @@ invoke_set_updater "RandomnessLog" "$(get_contract RandomnessLog)"
 invoke_set_updater "AutomationAnchor" "$(get_contract AutomationAnchor)"
 invoke_set_updater "ServiceLayerGateway" "$(get_contract ServiceLayerGateway)"
 
+FAILED=()
+# Expanding an empty array trips `set -u` on bash < 4.4, so skip the loop
+# when every contract was skipped.
+if ((${#PIDS[@]})); then
+  for i in "${!PIDS[@]}"; do
+    name="${NAMES[$i]}"
+    if ! wait "${PIDS[$i]}"; then
+      FAILED+=("$name")
+    fi
+    echo "--- ${name} ---"
+    cat "${LOG_DIR}/${name}.log"
+  done
+fi
+
+if [[ ${#FAILED[@]} -gt 0 ]]; then
+  echo "Error: setUpdater failed for: ${FAILED[*]}" >&2
+  exit 1
+fi
+
 echo "=== Done ==="
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 """Sync all MiniApps to Cloudflare R2 CDN with correct prefix."""
 
+import hashlib
+import json
+import mmap
+import sys
+
 import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 R2_ENDPOINT = "https://bf0d7e814f69945157f30505e9fba9fe.r2.cloudflarestorage.com"
 BUCKET_NAME = "miniapps"
@@ -12,47 +18,142 @@ AWS_SECRET_ACCESS_KEY = (
     "474c781a44136f6e6915dcd0b081956bf982e11dc61dba684b30c56c98b82b09"
 )
 APPS_DIR = Path("/home/neo/git/miniapps/apps")
+# Local (mtime, size) -> ETag cache so unchanged files are not re-hashed.
+ETAG_CACHE_PATH = Path.home() / ".cache" / "miniapps-r2-etags.json"
+
+# Shared by all transfer threads (botocore clients are thread-safe); the
+# pool matches the transfer concurrency so threads don't queue for a
+# connection.
+S3 = boto3.client(
+    "s3",
+    endpoint_url=R2_ENDPOINT,
+    aws_access_key_id=AWS_ACCESS_KEY_ID,
+    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+    region_name="auto",
+    config=Config(
+        max_pool_connections=32,
+        retries={"max_attempts": 5, "mode": "adaptive"},
+    ),
+)
 
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+EXTRA_HTML = {"ContentType": "text/html", "CacheControl": CACHE_CONTROL}
+EXTRA_JPEG = {"ContentType": "image/jpeg", "CacheControl": CACHE_CONTROL}
+
+FILES = [
+    ("index.html", "miniapps/index.html", EXTRA_HTML),
+    ("public/logo.jpg", "miniapps/logo.jpg", EXTRA_JPEG),
+    ("public/banner.jpg", "miniapps/banner.jpg", EXTRA_JPEG),
+]
+
+# Every file of every app is scheduled on one transfer pool, so a slow
+# upload only holds up its own slot rather than the rest of its app.
+TRANSFER_CONFIG = TransferConfig(
+    max_concurrency=32,
+    multipart_threshold=8 * 1024 * 1024,
+)
 
-def sync_app(app_name: str):
-    """Sync a single miniapp to R2 under miniapps/ prefix."""
-    app_path = APPS_DIR / app_name
 
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=R2_ENDPOINT,
-        aws_access_key_id=AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        region_name="auto",
-    )
+def load_etag_cache():
+    try:
+        return json.loads(ETAG_CACHE_PATH.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
 
-    files = [
-        ("index.html", "miniapps/index.html", "text/html"),
-        ("public/logo.jpg", "miniapps/logo.jpg", "image/png"),
-        ("public/banner.jpg", "miniapps/banner.jpg", "image/png"),
-    ]
 
-    results = []
-    for local_name, s3_key, content_type in files:
+def save_etag_cache(cache):
+    ETAG_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    ETAG_CACHE_PATH.write_text(json.dumps(cache))
+
+
+# Below this size mmap setup costs more than simply reading the file.
+MMAP_MIN_SIZE = 64 * 1024
+
+
+def _etag(data, size: int) -> str:
+    if size < TRANSFER_CONFIG.multipart_threshold:
+        return hashlib.md5(data).hexdigest()
+    # Multipart objects carry md5(concat(part md5s))-<part count>.
+    chunk = TRANSFER_CONFIG.multipart_chunksize
+    digests = b"".join(
+        hashlib.md5(data[i : i + chunk]).digest() for i in range(0, size, chunk)
+    )
+    return f"{hashlib.md5(digests).hexdigest()}-{-(-size // chunk)}"
+
+
+def compute_etag(path: Path, size: int) -> str:
+    """ETag R2/S3 will report for `path` when uploaded with TRANSFER_CONFIG."""
+    with open(path, "rb") as f:
+        if size < MMAP_MIN_SIZE:
+            return _etag(f.read(), size)
+        # Hash straight from the page cache instead of copying into a bytes object.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return _etag(view, size)
+            finally:
+                view.release()
+
+
+def local_etag(path: Path, cache) -> str:
+    stat = path.stat()
+    cached = cache.get(str(path))
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    etag = compute_etag(path, stat.st_size)
+    cache[str(path)] = [stat.st_mtime_ns, stat.st_size, etag]
+    return etag
+
+
+def remote_etags():
+    """ETags of everything under miniapps/, fetched with one paginated listing."""
+    etags = {}
+    paginator = S3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix="miniapps/"):
+        for obj in page.get("Contents", []):
+            etags[obj["Key"]] = obj["ETag"].strip('"')
+    return etags
+
+
+def sync_app(manager, app_name: str, etags, cache):
+    """Queue a single miniapp's changed files for upload to R2 under miniapps/ prefix."""
+    app_path = APPS_DIR / app_name
+
+    queued = []
+    for local_name, s3_key, extra_args in FILES:
         full_local = app_path / local_name
         full_s3_key = f"miniapps/{app_name}/{s3_key.split('/')[-1]}"
 
+        if not full_local.is_file():
+            queued.append((s3_key, "MISSING"))
+            continue
+        if etags.get(full_s3_key) == local_etag(full_local, cache):
+            queued.append((s3_key, "UNCHANGED"))
+            continue
+        future = manager.upload(
+            str(full_local),
+            BUCKET_NAME,
+            full_s3_key,
+            extra_args=extra_args,
+        )
+        queued.append((s3_key, future))
+
+    return queued
+
+
+def wait_app(queued):
+    """Wait for a miniapp's queued uploads and return (s3_key, status) pairs."""
+    results = []
+    for s3_key, upload in queued:
+        if isinstance(upload, str):
+            results.append((s3_key, upload))
+            continue
         try:
-            with open(full_local, "rb") as f:
-                s3.put_object(
-                    Body=f,
-                    Bucket=BUCKET_NAME,
-                    Key=full_s3_key,
-                    ContentType=content_type,
-                    CacheControl="public, max-age=31536000, immutable",
-                )
+            upload.result()
             results.append((s3_key, "OK"))
-        except FileNotFoundError:
-            results.append((s3_key, "MISSING"))
         except Exception as e:
             results.append((s3_key, f"ERROR: {e}"))
-
-    return app_name, results
+    return results
 
 
 def main():
@@ -64,14 +165,19 @@ def main():
     apps = sorted([d.name for d in APPS_DIR.iterdir() if d.is_dir()])
     print(f"Found {len(apps)} apps")
 
+    # --force re-uploads everything, e.g. after changing object metadata.
+    etags = {} if "--force" in sys.argv[1:] else remote_etags()
+    cache = load_etag_cache()
+
     success = 0
     failed = 0
+    unchanged = 0
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {executor.submit(sync_app, app): app for app in apps}
+    with create_transfer_manager(S3, TRANSFER_CONFIG) as manager:
+        queued = {app: sync_app(manager, app, etags, cache) for app in apps}
 
-        for future in as_completed(futures):
-            app_name, results = future.result()
+        for app_name, uploads in queued.items():
+            results = wait_app(uploads)
             has_error = any("ERROR" in r[1] or "MISSING" in r[1] for r in results)
 
             status = "✓" if not has_error else "✗"
@@ -84,9 +190,12 @@ def main():
                 success += 1
             else:
                 failed += 1
+            unchanged += sum(1 for r in results if r[1] == "UNCHANGED")
+
+    save_etag_cache(cache)
 
     print("-" * 60)
-    print(f"Complete: {success} synced, {failed} failed")
+    print(f"Complete: {success} synced, {failed} failed ({unchanged} files unchanged)")
 
 
 if __name__ == "__main__":
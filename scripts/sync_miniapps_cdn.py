@@ -3,6 +3,8 @@
 
 import boto3
 import os
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
 from pathlib import Path
 
 R2_ENDPOINT = "https://bf0d7e814f69945157f30505e9fba9fe.r2.cloudflarestorage.com"
@@ -13,49 +15,68 @@ AWS_SECRET_ACCESS_KEY = (
 )
 APPS_DIR = Path("/home/neo/git/miniapps-repo/apps")
 
+# Created once and shared by every upload so HTTPS connections are reused;
+# the pool matches the transfer concurrency below.
+S3 = boto3.client(
+    "s3",
+    endpoint_url=R2_ENDPOINT,
+    aws_access_key_id=AWS_ACCESS_KEY_ID,
+    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+    region_name="auto",
+    config=Config(
+        max_pool_connections=32,
+        retries={"max_attempts": 5, "mode": "adaptive"},
+    ),
+)
+
+TRANSFER_CONFIG = TransferConfig(max_concurrency=32)
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+EXTRA_HTML = {"ContentType": "text/html", "CacheControl": CACHE_CONTROL}
+EXTRA_JPEG = {"ContentType": "image/jpeg", "CacheControl": CACHE_CONTROL}
+
+# Files to upload: index.html, public/logo.jpg, public/banner.jpg
+FILES_TO_UPLOAD = [
+    ("index.html", "index.html", EXTRA_HTML),
+    ("public/logo.jpg", "logo.jpg", EXTRA_JPEG),
+    ("public/banner.jpg", "banner.jpg", EXTRA_JPEG),
+]
+
 
-def sync_app_to_r2(app_path: Path):
-    """Sync a single miniapp to R2."""
+def sync_app_to_r2(manager, app_path: Path):
+    """Queue a single miniapp's uploads to R2."""
     app_name = app_path.name
-    print(f"Syncing {app_name}...")
 
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=R2_ENDPOINT,
-        aws_access_key_id=AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        region_name="auto",
-    )
-
-    # Files to upload: index.html, public/logo.jpg, public/banner.jpg
-    files_to_upload = [
-        ("index.html", "index.html"),
-        ("public/logo.jpg", "logo.jpg"),
-        ("public/banner.jpg", "banner.jpg"),
-    ]
-
-    for local_path, s3_key in files_to_upload:
+    queued = []
+    for local_path, s3_key, extra_args in FILES_TO_UPLOAD:
         full_local = app_path / local_path
         full_s3_key = f"{app_name}/{s3_key}"
 
         if full_local.exists():
-            try:
-                s3.upload_file(
-                    str(full_local),
-                    BUCKET_NAME,
-                    full_s3_key,
-                    ExtraArgs={
-                        "ContentType": "text/html"
-                        if s3_key == "index.html"
-                        else "image/png",
-                        "CacheControl": "public, max-age=31536000, immutable",
-                    },
-                )
-                print(f"  ✓ {full_s3_key}")
-            except Exception as e:
-                print(f"  ✗ Failed {full_s3_key}: {e}")
+            future = manager.upload(
+                str(full_local),
+                BUCKET_NAME,
+                full_s3_key,
+                extra_args=extra_args,
+            )
+            queued.append((local_path, full_s3_key, future))
         else:
+            queued.append((local_path, full_s3_key, None))
+    return queued
+
+
+def report_app(app_name: str, queued):
+    """Wait for a miniapp's uploads and print the outcome of each file."""
+    print(f"Syncing {app_name}...")
+    for local_path, full_s3_key, future in queued:
+        if future is None:
             print(f"  ✗ Missing {local_path}")
+            continue
+        try:
+            future.result()
+            print(f"  ✓ {full_s3_key}")
+        except Exception as e:
+            print(f"  ✗ Failed {full_s3_key}: {e}")
 
 
 def main():
@@ -63,9 +84,13 @@ def main():
     print(f"Bucket: {BUCKET_NAME}")
     print("-" * 50)
 
-    for app_path in sorted(APPS_DIR.iterdir()):
-        if app_path.is_dir():
-            sync_app_to_r2(app_path)
+    app_paths = [p for p in sorted(APPS_DIR.iterdir()) if p.is_dir()]
+    # Queue every app up front so uploads overlap across apps; results are
+    # still reported in app order.
+    with create_transfer_manager(S3, TRANSFER_CONFIG) as manager:
+        queued = [(p.name, sync_app_to_r2(manager, p)) for p in app_paths]
+        for app_name, uploads in queued:
+            report_app(app_name, uploads)
 
     print("-" * 50)
     print("Done!")
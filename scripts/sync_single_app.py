@@ -3,6 +3,8 @@
 
 import boto3
 import sys
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 
 R2_ENDPOINT = "https://bf0d7e814f69945157f30505e9fba9fe.r2.cloudflarestorage.com"
 BUCKET_NAME = "miniapps"
@@ -11,41 +13,52 @@ AWS_SECRET_ACCESS_KEY = (
     "474c781a44136f6e6915dcd0b081956bf982e11dc61dba684b30c56c98b82b09"
 )
 
+S3 = boto3.client(
+    "s3",
+    endpoint_url=R2_ENDPOINT,
+    aws_access_key_id=AWS_ACCESS_KEY_ID,
+    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+    region_name="auto",
+    config=Config(retries={"max_attempts": 5, "mode": "adaptive"}),
+)
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+EXTRA_HTML = {"ContentType": "text/html", "CacheControl": CACHE_CONTROL}
+EXTRA_JPEG = {"ContentType": "image/jpeg", "CacheControl": CACHE_CONTROL}
+
+# Files to upload
+FILES = [
+    ("index.html", "index.html", EXTRA_HTML),
+    ("public/logo.jpg", "logo.jpg", EXTRA_JPEG),
+    ("public/banner.jpg", "banner.jpg", EXTRA_JPEG),
+]
+
+# Files are streamed from disk; anything above the threshold goes up in
+# parallel parts that are retried individually.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=5 * 1024 * 1024,
+    max_concurrency=4,
+)
+
 
 def sync_single_app(app_name: str):
     """Sync a single miniapp to R2."""
     print(f"Syncing {app_name}...")
 
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=R2_ENDPOINT,
-        aws_access_key_id=AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        region_name="auto",
-    )
-
     app_path = f"/home/neo/git/miniapps/apps/{app_name}"
 
-    # Files to upload
-    files = [
-        ("index.html", "index.html", "text/html"),
-        ("public/logo.jpg", "logo.jpg", "image/png"),
-        ("public/banner.jpg", "banner.jpg", "image/png"),
-    ]
-
-    for local_name, s3_key, content_type in files:
+    for local_name, s3_key, extra_args in FILES:
         full_local = f"{app_path}/{local_name}"
         full_s3_key = f"{app_name}/{s3_key}"
 
         try:
-            with open(full_local, "rb") as f:
-                s3.put_object(
-                    Body=f,
-                    Bucket=BUCKET_NAME,
-                    Key=full_s3_key,
-                    ContentType=content_type,
-                    CacheControl="public, max-age=31536000, immutable",
-                )
+            S3.upload_file(
+                full_local,
+                BUCKET_NAME,
+                full_s3_key,
+                ExtraArgs=extra_args,
+                Config=TRANSFER_CONFIG,
+            )
             print(f"  ✓ {full_s3_key}")
         except FileNotFoundError:
             print(f"  ✗ Missing {full_local}")